@@ -21,8 +21,11 @@ class Settings:
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     OPENAI_BASE_URL: str = "https://api.openai.com/v1"
     OPENAI_MODEL: str = "gpt-4.1"
+    OPENAI_SUMMARY_MODEL: str = os.getenv("OPENAI_SUMMARY_MODEL", "gpt-4.1-mini")
     
     TEMP_DIR_PREFIX: str = f"{PROJECT_NAME}_"
+    # Persistent root for Go's build and module caches; Go's per-user defaults are used when unset
+    GO_CACHE_DIR: Optional[str] = os.getenv("GO_CACHE_DIR")
     
     GITHUB_URL: str = "https://github.com"
     GITHUB_TOKEN: Optional[str] = os.getenv("GITHUB_TOKEN")
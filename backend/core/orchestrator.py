@@ -1,8 +1,10 @@
+import asyncio
 from typing import AsyncGenerator
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
 from tools import ALL_TOOLS
 from utils.logging_config import get_logger
+from utils.async_tool_decorator import is_async_tool
 from models.api_models import OrchestratorUpdate
 from config.settings import settings
 
@@ -79,14 +81,16 @@ class Orchestrator:
                         
                         try:
                             tool = self.tools_map[tool_name]
-                            is_async = getattr(tool, '_is_async_tool', False)
+                            is_async = is_async_tool(tool)
                             
                             logger.debug(f"Executing {tool_name} - ASYNC: {is_async}")
 
                             if is_async:
                                 result = await tool.ainvoke(tool_args)
                             else:
-                                result = tool.invoke(tool_args)
+                                # Run blocking tools (clone, explore, cleanup) off the event loop so
+                                # other tasks and websocket updates keep making progress
+                                result = await asyncio.to_thread(tool.invoke, tool_args)
                             
                             execution_state['tools_executed'] += 1
                             
@@ -41,8 +41,8 @@ class ToolService:
     def _extract_parameters(self, tool) -> Dict[str, Any]:
         """Extract parameter information from the tool"""
         try:
-            # Get the function signature
-            sig = inspect.signature(tool.func)
+            # Get the function signature; async tools only carry a coroutine
+            sig = inspect.signature(tool.func or tool.coroutine)
             parameters = {}
             
             for param_name, param in sig.parameters.items():
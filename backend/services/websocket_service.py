@@ -1,4 +1,5 @@
 from typing import Dict, Any
+from datetime import datetime
 import json
 from fastapi import WebSocket
 from utils.logging_config import get_logger
@@ -44,7 +45,6 @@ class WebsocketService:
         if websocket:
             try:
                 # Always ensure timestamp is present and valid
-                from datetime import datetime
                 message["timestamp"] = datetime.now().isoformat()
                 
                 # Ensure task_id is always present
@@ -0,0 +1,47 @@
+import json
+
+from tools.reporting.generate_summary_tool import (
+    MAX_PROMPT_BYTES,
+    _fit_to_budget,
+    _truncate_for_prompt,
+)
+from utils import serialization
+
+def _build_prompt_data(tool_results):
+    """Prepare prompt data the same way generate_summary does."""
+    prompt_results = _truncate_for_prompt(tool_results, priority=isinstance(tool_results, str))
+    return _fit_to_budget(prompt_results, serialization.dumps(prompt_results, default=str))
+
+def test_oversized_vulnerability_report_keeps_findings():
+    report = "Vulnerability #1: GO-2024-0001 in example.com/module\n" * 20000
+    tool_results = {
+        "scan_go_vulnerabilities": report,
+        "explore_codebase": {"total_files": 12},
+    }
+
+    prompt_results, prompt_data = _build_prompt_data(tool_results)
+
+    assert len(prompt_data.encode("utf-8")) <= MAX_PROMPT_BYTES
+    parsed = json.loads(prompt_data)
+    assert "Vulnerability #1" in parsed["scan_go_vulnerabilities"]
+    assert "more chars>" in parsed["scan_go_vulnerabilities"]
+    # Small sections are not dropped to make room
+    assert parsed["explore_codebase"] == {"total_files": 12}
+
+def test_oversized_vulnerability_list_is_cut_not_elided():
+    findings = [{"id": f"GO-2024-{i:04d}", "details": "x" * 500} for i in range(2000)]
+
+    prompt_results, prompt_data = _build_prompt_data({"scan_go_vulnerabilities": findings})
+
+    assert len(prompt_data.encode("utf-8")) <= MAX_PROMPT_BYTES
+    kept = json.loads(prompt_data)["scan_go_vulnerabilities"]
+    assert kept[0]["id"] == "GO-2024-0000"
+    assert kept[-1]["_truncated"] == 2000 - (len(kept) - 1)
+
+def test_prompt_within_budget_is_unchanged():
+    tool_results = {"scan_go_vulnerabilities": "No vulnerabilities found"}
+
+    prompt_results, prompt_data = _build_prompt_data(tool_results)
+
+    assert prompt_results == tool_results
+    assert json.loads(prompt_data) == tool_results
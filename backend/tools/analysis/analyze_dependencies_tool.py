@@ -1,14 +1,21 @@
 import os
-import json
 import re
 import time
 from langchain_core.tools import tool
 from utils.logging_config import get_logger
 from utils.tool_metadata_decorator import tool_category
+from utils import serialization
 from models.api_models import StandardToolResponse, StandardMetrics, StandardError
 
 logger = get_logger(__name__)
 
+# Manifest patterns, compiled once at import instead of on every call
+REQUIREMENT_SPECIFIER_PATTERN = re.compile(r'[=<>~!]')
+POM_ARTIFACT_PATTERN = re.compile(r'<artifactId>([^<]+)</artifactId>')
+CARGO_DEPENDENCIES_PATTERN = re.compile(r'\[dependencies\](.*?)(?:\[|$)', re.DOTALL)
+CARGO_CRATE_PATTERN = re.compile(r'^([a-zA-Z0-9_-]+)\s*=', re.MULTILINE)
+GEM_PATTERN = re.compile(r"gem\s+['\"]([^'\"]+)['\"]")
+
 @tool_category("analysis")
 @tool
 def analyze_dependencies(repository_path: str) -> StandardToolResponse:
@@ -47,7 +54,7 @@ def analyze_dependencies(repository_path: str) -> StandardToolResponse:
                         line = line.strip()
                         if line and not line.startswith('#'):
                             # Extract package name (before ==, >=, ~=, etc.)
-                            dep_name = re.split(r'[=<>~!]', line)[0].strip()
+                            dep_name = REQUIREMENT_SPECIFIER_PATTERN.split(line)[0].strip()
                             if dep_name:
                                 deps.append(dep_name)
                     dependencies['Python'] = deps[:20]  # Limit for readability
@@ -59,8 +66,8 @@ def analyze_dependencies(repository_path: str) -> StandardToolResponse:
         if os.path.exists(package_file):
             files_analyzed += 1
             try:
-                with open(package_file, 'r') as f:
-                    package_data = json.load(f)
+                with open(package_file, 'rb') as f:
+                    package_data = serialization.loads(f.read())
                     deps = []
                     if 'dependencies' in package_data:
                         deps.extend(list(package_data['dependencies'].keys()))
@@ -75,9 +82,23 @@ def analyze_dependencies(repository_path: str) -> StandardToolResponse:
         if os.path.exists(go_mod):
             files_analyzed += 1
             try:
+                # Single line-by-line pass over require lines and blocks; stops once the limit is reached
                 with open(go_mod, 'r') as f:
-                    content = f.read()
-                    deps = re.findall(r'require\s+([^\s]+)', content)
+                    deps = []
+                    in_require_block = False
+                    for line in f:
+                        line = line.strip()
+                        if in_require_block:
+                            if line == ')':
+                                in_require_block = False
+                            elif line and not line.startswith('//'):
+                                deps.append(line.split()[0])
+                        elif line.startswith('require ('):
+                            in_require_block = True
+                        elif line.startswith('require '):
+                            deps.append(line.split()[1])
+                        if len(deps) >= 20:
+                            break
                     dependencies['Go'] = deps[:20]
             except Exception as e:
                 logger.warning(f"Failed to parse go.mod: {e}")
@@ -89,7 +110,7 @@ def analyze_dependencies(repository_path: str) -> StandardToolResponse:
             try:
                 with open(pom_file, 'r') as f:
                     content = f.read()
-                    deps = re.findall(r'<artifactId>([^<]+)</artifactId>', content)
+                    deps = POM_ARTIFACT_PATTERN.findall(content)
                     dependencies['Java'] = deps[:20]
             except Exception as e:
                 logger.warning(f"Failed to parse pom.xml: {e}")
@@ -102,10 +123,10 @@ def analyze_dependencies(repository_path: str) -> StandardToolResponse:
                 with open(cargo_file, 'r') as f:
                     content = f.read()
                     # Simple regex to find dependencies section
-                    deps_match = re.search(r'\[dependencies\](.*?)(?:\[|$)', content, re.DOTALL)
+                    deps_match = CARGO_DEPENDENCIES_PATTERN.search(content)
                     if deps_match:
                         deps_section = deps_match.group(1)
-                        deps = re.findall(r'^([a-zA-Z0-9_-]+)\s*=', deps_section, re.MULTILINE)
+                        deps = CARGO_CRATE_PATTERN.findall(deps_section)
                         dependencies['Rust'] = deps[:20]
             except Exception as e:
                 logger.warning(f"Failed to parse Cargo.toml: {e}")
@@ -115,8 +136,8 @@ def analyze_dependencies(repository_path: str) -> StandardToolResponse:
         if os.path.exists(composer_file):
             files_analyzed += 1
             try:
-                with open(composer_file, 'r') as f:
-                    composer_data = json.load(f)
+                with open(composer_file, 'rb') as f:
+                    composer_data = serialization.loads(f.read())
                     deps = []
                     if 'require' in composer_data:
                         deps.extend(list(composer_data['require'].keys()))
@@ -133,7 +154,7 @@ def analyze_dependencies(repository_path: str) -> StandardToolResponse:
             try:
                 with open(gemfile, 'r') as f:
                     content = f.read()
-                    deps = re.findall(r"gem\s+['\"]([^'\"]+)['\"]", content)
+                    deps = GEM_PATTERN.findall(content)
                     dependencies['Ruby'] = deps[:20]
             except Exception as e:
                 logger.warning(f"Failed to parse Gemfile: {e}")
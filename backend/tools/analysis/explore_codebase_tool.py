@@ -1,6 +1,6 @@
 import os
-import json
 import time
+import heapq
 from typing import Dict, Any, List
 from pathlib import Path
 from collections import defaultdict, Counter
@@ -8,6 +8,7 @@ from langchain_core.tools import tool
 
 from utils.logging_config import get_logger
 from utils.tool_metadata_decorator import tool_category
+from utils import serialization
 from models.api_models import StandardToolResponse, StandardMetrics, StandardError
 
 logger = get_logger(__name__)
@@ -166,8 +167,13 @@ def _analyze_file_structure(root_path: str) -> Dict[str, Any]:
         'target', 'out', '.svn', 'vendor', 'bower_components'
     }
     
+    # Code files whose lines are counted
+    code_extensions = {'.py', '.js', '.jsx', '.ts', '.tsx', '.java', '.cpp', '.c', '.go', '.rs', '.rb', '.php', '.swift', '.kt'}
+    
     file_type_counter = Counter()
     directory_files = defaultdict(list)
+    # Insertion-ordered set of important directories seen, for O(1) membership checks
+    seen_important_dirs = {}
     
     try:
         for root, dirs, files in os.walk(root_path):
@@ -181,10 +187,7 @@ def _analyze_file_structure(root_path: str) -> Dict[str, Any]:
             # Track important directories
             for dir_part in relative_root.split(os.sep):
                 if dir_part.lower() in important_dirs:
-                    if dir_part not in file_stats['important_directories']:
-                        file_stats['important_directories'].append(dir_part)
-                    if dir_part not in file_stats['main_directories']:
-                        file_stats['main_directories'].append(dir_part)
+                    seen_important_dirs[dir_part] = None
             
             for file in files:
                 # Skip hidden files except important ones
@@ -199,7 +202,6 @@ def _analyze_file_structure(root_path: str) -> Dict[str, Any]:
                 directory_files[relative_root].append(file)
                 
                 # Count lines for code files and track largest files
-                code_extensions = {'.py', '.js', '.jsx', '.ts', '.tsx', '.java', '.cpp', '.c', '.go', '.rs', '.rb', '.php', '.swift', '.kt'}
                 if file_ext in code_extensions:
                     try:
                         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
@@ -211,15 +213,17 @@ def _analyze_file_structure(root_path: str) -> Dict[str, Any]:
                             file_stats['largest_files'].append({
                                 'path': relative_path,
                                 'lines': lines,
-                                'size': os.path.getsize(file_path),
+                                'size': os.fstat(f.fileno()).st_size,
                                 'extension': file_ext
                             })
                     except:
                         pass
         
-        # Sort and limit largest files
-        file_stats['largest_files'].sort(key=lambda x: x['lines'], reverse=True)
-        file_stats['largest_files'] = file_stats['largest_files'][:10]
+        # Keep only the 10 largest files without sorting the full list
+        file_stats['largest_files'] = heapq.nlargest(10, file_stats['largest_files'], key=lambda x: x['lines'])
+        
+        file_stats['important_directories'] = list(seen_important_dirs)
+        file_stats['main_directories'] = list(seen_important_dirs)
         
         # Convert counters to dictionaries
         file_stats['file_types'] = dict(file_type_counter.most_common())
@@ -286,15 +290,16 @@ def _detect_languages_and_frameworks(root_path: str) -> Dict[str, Any]:
         'Nuxt.js': ['nuxt.config.js', 'pages/', 'layouts/', 'components/']
     }
     
+    # Directories to skip when counting language files
+    skip_dirs = {'node_modules', '__pycache__', 'venv', 'env', 'dist', 'build', 'target'}
+    
     language_counts = Counter()
     
     try:
         # Count files by language
         for root, dirs, files in os.walk(root_path):
             # Skip common ignore directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in [
-                'node_modules', '__pycache__', 'venv', 'env', 'dist', 'build', 'target'
-            ]]
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in skip_dirs]
             
             for file in files:
                 ext = Path(file).suffix.lower()
@@ -577,8 +582,8 @@ def _analyze_dependencies(root_path: str) -> Dict[str, Any]:
         package_path = os.path.join(root_path, 'package.json')
         if os.path.exists(package_path):
             try:
-                with open(package_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                with open(package_path, 'rb') as f:
+                    data = serialization.loads(f.read())
                     prod_deps = list(data.get('dependencies', {}).keys())
                     dev_deps = list(data.get('devDependencies', {}).keys())
                     all_deps = prod_deps + dev_deps
@@ -1,19 +1,23 @@
+import asyncio
 import os
 import re
 import time
-import json
 from typing import Dict, List
 from dataclasses import dataclass
 from langchain_core.messages import SystemMessage, HumanMessage
 from utils.async_tool_decorator import async_tool
 from utils.tool_metadata_decorator import tool_category
 from utils.logging_config import get_logger
+from utils import serialization
 from models.api_models import StandardToolResponse, StandardMetrics, StandardError
 from config.settings import settings
 from langchain_openai import ChatOpenAI
 
 logger = get_logger(__name__)
 
+# Fenced JSON block in AI fix responses
+JSON_BLOCK_PATTERN = re.compile(r'```json\s*\n(.*?)\n```', re.DOTALL)
+
 @dataclass
 class VulnerabilityInfo:
     """Represents a parsed vulnerability from govulncheck output."""
@@ -71,7 +75,7 @@ class GovulncheckParser:
         current_description = ""
         is_standard_lib = False
         
-        for line in lines:
+        for line_index, line in enumerate(lines):
             line = line.strip()
             
             # Check for vulnerability header (e.g., "Vulnerability #1: GO-2025-3770")
@@ -118,8 +122,7 @@ class GovulncheckParser:
                 current_version = found_match.group(2)
                 
                 # Look ahead for Fixed in pattern
-                current_line_index = lines.index(line)
-                for next_line in lines[current_line_index+1:current_line_index+5]:
+                for next_line in lines[line_index+1:line_index+5]:
                     fixed_match = cls.FIXED_IN_PATTERN.search(next_line.strip())
                     if fixed_match:
                         fixed_version = fixed_match.group(2)
@@ -262,7 +265,10 @@ async def _handle_go_changes_with_ai(repository_path: str, prompt: str, start_ti
         from utils.build_validator import BuildValidator
         
         build_validator = BuildValidator()
-        build_result = build_validator.validate_fixes(repository_path, fix_result.updated_files)
+        # go mod tidy/build can take minutes; run them off the event loop so other sessions keep progressing
+        build_result = await asyncio.to_thread(
+            build_validator.validate_fixes, repository_path, fix_result.updated_files
+        )
         
         if not build_result.success:
             execution_time_ms = int((time.time() - start_time) * 1000)
@@ -677,14 +683,14 @@ def _parse_ai_response(ai_response: str) -> FixResult:
     """Parse AI response and return FixResult."""
     try:
         # Look for JSON in code blocks first
-        json_match = re.search(r'```json\s*\n(.*?)\n```', ai_response, re.DOTALL)
+        json_match = JSON_BLOCK_PATTERN.search(ai_response)
         if json_match:
             json_str = json_match.group(1).strip()
         else:
             # Try the entire response as JSON
             json_str = ai_response.strip()
         
-        data = json.loads(json_str)
+        data = serialization.loads(json_str)
         
         return FixResult(
             success=data.get("success", False),
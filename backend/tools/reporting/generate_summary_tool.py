@@ -1,19 +1,267 @@
-import json
+import re
 import time
-from typing import Any
-from langchain_core.tools import tool
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from utils.logging_config import get_logger
 from utils.tool_metadata_decorator import tool_category
+from utils.async_tool_decorator import async_tool
+from utils import serialization
 from config.settings import settings
 from models.api_models import StandardToolResponse, StandardMetrics, StandardError
 
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
 logger = get_logger(__name__)
 
+# Limits applied to tool results before they are embedded in the prompt
+MAX_PROMPT_LIST_ITEMS = 50
+MAX_PROMPT_STRING_CHARS = 4000
+
+# Looser limits for priority sections (and a bare string input) so findings survive truncation
+PRIORITY_PROMPT_LIST_ITEMS = 500
+PRIORITY_PROMPT_STRING_CHARS = 100_000
+
+# Verbose per-file listings from explore_codebase that do not help the summary and are dropped from the prompt
+PROMPT_EXCLUDED_KEYS = frozenset({
+    "directory_structure",
+    "found_files"
+})
+
+# Hard budget for UTF-8 encoded prompt data (~30k tokens); the largest sections are cut down beyond it
+MAX_PROMPT_BYTES = 120_000
+
+# Marker appended by _truncate_for_prompt to strings it shortened
+TRUNCATED_CHARS_PATTERN = re.compile(r"\.\.\.<(\d+) more chars>$")
+
+# Non-priority sections smaller than this are never cut, and are replaced by a stub rather than cut below it
+MIN_PROMPT_SECTION_BYTES = 1024
+
+# Sections cut only after everything else when the prompt is over budget, and never removed entirely
+PRIORITY_PROMPT_KEYS = frozenset({
+    "scan_go_vulnerabilities",
+    "vulnerabilities",
+    "security_issues"
+})
+
+# Prompt data larger than this is summarized with the full model instead of the summary model
+LARGE_PROMPT_BYTES = 32 * 1024
+
+# Built once so every request starts with a byte-identical prefix for OpenAI's prompt caching
+SUMMARY_SYSTEM_PROMPT = """
+You are an expert code analysis assistant. Analyze the repository analysis results provided and create a clear, comprehensive summary.
+
+Focus on:
+- Key findings and insights
+- Security issues if any
+- Code quality observations
+- Actionable recommendations
+
+Provide a clear, readable summary that would be useful for developers and stakeholders.
+"""
+SUMMARY_SYSTEM_MESSAGE = SystemMessage(content=SUMMARY_SYSTEM_PROMPT)
+SUMMARY_REQUEST_MESSAGE = HumanMessage(
+    content="Please analyze and summarize the repository analysis results in the next message (compact JSON)."
+)
+
+# Static messages sent ahead of the tool results; only the final message varies between requests
+SUMMARY_PROMPT_PREFIX = (SUMMARY_SYSTEM_MESSAGE, SUMMARY_REQUEST_MESSAGE)
+
+# Returned without calling the LLM when there are no tool results
+EMPTY_RESULTS_SUMMARY = "No tool results were available to summarize."
+
+# Bump whenever the summary prompt changes so cached summaries from the old prompt are not reused
+SUMMARY_PROMPT_VERSION = "2"
+
+# In-memory LRU of generated summaries keyed by a hash of the prompt data
+SUMMARY_CACHE_SIZE = 128
+SUMMARY_CACHE_TTL_SECONDS = 24 * 60 * 60
+_summary_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+def _truncate_for_prompt(value: Any, priority: bool = False) -> Any:
+    """Recursively drop verbose fields and cap list lengths and string sizes so tool output stays within the context window."""
+    list_items = PRIORITY_PROMPT_LIST_ITEMS if priority else MAX_PROMPT_LIST_ITEMS
+    string_chars = PRIORITY_PROMPT_STRING_CHARS if priority else MAX_PROMPT_STRING_CHARS
+    if isinstance(value, dict):
+        return {
+            key: _truncate_for_prompt(item, priority or key in PRIORITY_PROMPT_KEYS)
+            for key, item in value.items()
+            if key not in PROMPT_EXCLUDED_KEYS
+        }
+    if isinstance(value, (list, tuple)):
+        truncated = [_truncate_for_prompt(item, priority) for item in value[:list_items]]
+        if len(value) > list_items:
+            truncated.append({"_truncated": len(value) - list_items})
+        return truncated
+    if isinstance(value, str) and len(value) > string_chars:
+        return f"{value[:string_chars]}...<{len(value) - string_chars} more chars>"
+    return value
+
+@functools.lru_cache(maxsize=2)
+def _get_llm(model: str) -> ChatOpenAI:
+    """Return a shared client per model so HTTP connections are reused across summaries."""
+    return ChatOpenAI(
+        model=model,
+        temperature=0.2,
+        api_key=settings.OPENAI_API_KEY,
+        base_url=settings.OPENAI_BASE_URL
+    )
+
+def _encoded_size(value: Any) -> int:
+    """Size in bytes of a value's UTF-8 encoded JSON serialization."""
+    return len(serialization.dumps(value, default=str).encode("utf-8"))
+
+def _cut_to_size(value: Any, max_bytes: int) -> Any:
+    """Shrink a section to about max_bytes of JSON, keeping its leading content and a count of what was dropped."""
+    if isinstance(value, str):
+        # Count characters already dropped by _truncate_for_prompt so the marker stays accurate
+        dropped = 0
+        marker = TRUNCATED_CHARS_PATTERN.search(value)
+        if marker is not None:
+            dropped = int(marker.group(1))
+            value = value[:marker.start()]
+        # Scale the cut by the JSON escaping overhead so the serialized string lands near max_bytes
+        data = value.encode("utf-8")
+        keep_bytes = max(0, len(data) * max_bytes // max(_encoded_size(value), 1))
+        kept = data[:keep_bytes].decode("utf-8", errors="ignore")
+        return f"{kept}...<{len(value) - len(kept) + dropped} more chars>"
+    if isinstance(value, list):
+        dropped = 0
+        if value and isinstance(value[-1], dict) and value[-1].keys() == {"_truncated"}:
+            dropped = value[-1]["_truncated"]
+            value = value[:-1]
+        kept = []
+        used = 2
+        for item in value:
+            item_size = _encoded_size(item) + 1
+            if used + item_size > max_bytes:
+                break
+            kept.append(item)
+            used += item_size
+        if len(kept) < len(value) or dropped:
+            kept.append({"_truncated": len(value) - len(kept) + dropped})
+        return kept
+    return _cut_to_size(serialization.dumps(value, default=str), max_bytes)
+
+def _water_fill(sizes: Dict[str, int], available: int) -> Dict[str, int]:
+    """Split available bytes so sections under an equal share stay whole and larger ones are cut to that share."""
+    allowances = {}
+    remaining = max(available, 0)
+    ordered = sorted(sizes, key=sizes.get)
+    for index, key in enumerate(ordered):
+        allowances[key] = min(sizes[key], remaining // (len(ordered) - index))
+        remaining -= allowances[key]
+    return allowances
+
+def _section_allowances(sizes: Dict[str, int], available: int) -> Dict[str, int]:
+    """Decide how many bytes each top-level section may keep, cutting non-priority sections before priority ones."""
+    small = {key: size for key, size in sizes.items() if key not in PRIORITY_PROMPT_KEYS and size < MIN_PROMPT_SECTION_BYTES}
+    priority = {key: size for key, size in sizes.items() if key in PRIORITY_PROMPT_KEYS}
+    large = {key: size for key, size in sizes.items() if key not in small and key not in priority}
+    
+    # Small sections stay whole: dropping them would barely help reach the budget
+    allowances = dict(small)
+    available -= sum(small.values())
+    priority_total = sum(priority.values())
+    if priority_total <= available:
+        allowances.update(priority)
+        allowances.update(_water_fill(large, available - priority_total))
+    else:
+        # Findings come first: large non-priority sections give up their space before priority ones are cut
+        allowances.update(dict.fromkeys(large, 0))
+        allowances.update(_water_fill(priority, available))
+    return allowances
+
+def _fit_sections(prompt_results: Dict[str, Any], sizes: Dict[str, int], available: int) -> Dict[str, Any]:
+    """Cut or stub top-level sections so their combined serialized size is about available bytes."""
+    allowances = _section_allowances(sizes, available)
+    fitted = {}
+    for key, value in prompt_results.items():
+        allowance = allowances[key]
+        if allowance >= sizes[key]:
+            fitted[key] = value
+        elif key not in PRIORITY_PROMPT_KEYS and allowance < MIN_PROMPT_SECTION_BYTES:
+            fitted[key] = {"_truncated": True, "original_keys": len(value) if isinstance(value, dict) else 0}
+        else:
+            fitted[key] = _cut_to_size(value, allowance)
+    return fitted
+
+def _fit_to_budget(prompt_results: Any, prompt_data: str) -> Tuple[Any, str]:
+    """Cut down the largest sections, keeping priority findings, until the prompt data fits MAX_PROMPT_BYTES."""
+    size = len(prompt_data.encode("utf-8"))
+    if size <= MAX_PROMPT_BYTES:
+        return prompt_results, prompt_data
+    
+    if isinstance(prompt_results, (dict, list, str)):
+        sizes = {key: _encoded_size(value) for key, value in prompt_results.items()} if isinstance(prompt_results, dict) else None
+        # Keys, separators and truncation markers are not counted up front, so retry against the measured overshoot
+        target = MAX_PROMPT_BYTES
+        for _ in range(3):
+            if sizes is not None:
+                fitted = _fit_sections(prompt_results, sizes, target)
+            else:
+                fitted = _cut_to_size(prompt_results, target)
+            fitted_data = serialization.dumps(fitted, default=str)
+            fitted_size = len(fitted_data.encode("utf-8"))
+            if fitted_size <= MAX_PROMPT_BYTES:
+                break
+            target -= fitted_size - MAX_PROMPT_BYTES
+        prompt_results, prompt_data = fitted, fitted_data
+    
+    if len(prompt_data.encode("utf-8")) > MAX_PROMPT_BYTES:
+        # Still too large, so cut the serialized text itself
+        marker = "...<truncated>"
+        prompt_data = prompt_data.encode("utf-8")[:MAX_PROMPT_BYTES - len(marker)].decode("utf-8", errors="ignore") + marker
+    
+    logger.warning(f"Summary prompt data exceeded {MAX_PROMPT_BYTES} bytes and was truncated")
+    return prompt_results, prompt_data
+
+def _select_summary_model(prompt_data: str) -> str:
+    """Use the faster summary model unless the prompt is large enough to need the full model."""
+    if len(prompt_data) > LARGE_PROMPT_BYTES:
+        return settings.OPENAI_MODEL
+    return settings.OPENAI_SUMMARY_MODEL
+
+def _summary_cache_key(model: str, canonical_data: str) -> str:
+    """Hash canonically serialized prompt data together with the prompt version and model that will summarize it."""
+    payload = f"{SUMMARY_PROMPT_VERSION}\n{model}\n{canonical_data}".encode("utf-8")
+    # 128-bit digests are plenty for a local cache key
+    if blake3 is not None:
+        return blake3.blake3(payload).hexdigest(length=16)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def _get_cached_summary(cache_key: str) -> Optional[str]:
+    """Return a previously generated summary that has not expired, marking it as recently used."""
+    with _summary_cache_lock:
+        entry = _summary_cache.get(cache_key)
+        if entry is None:
+            return None
+        stored_at, summary = entry
+        if time.monotonic() - stored_at > SUMMARY_CACHE_TTL_SECONDS:
+            del _summary_cache[cache_key]
+            return None
+        _summary_cache.move_to_end(cache_key)
+        return summary
+
+def _store_cached_summary(cache_key: str, summary: str) -> None:
+    """Store a generated summary, evicting the least recently used entry when full."""
+    with _summary_cache_lock:
+        _summary_cache[cache_key] = (time.monotonic(), summary)
+        _summary_cache.move_to_end(cache_key)
+        while len(_summary_cache) > SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+
 @tool_category("reporting")
-@tool
-def generate_summary(tool_results: Any) -> StandardToolResponse:
+@async_tool
+async def generate_summary(tool_results: Any) -> StandardToolResponse:
     """Generate summary of all tool calls.
 
     Generate summary of all previous tool calls.
@@ -28,6 +276,19 @@ def generate_summary(tool_results: Any) -> StandardToolResponse:
     logger.info("Generating summary from context window")
     
     try:
+        # Nothing to summarize: answer directly rather than paying for an LLM round-trip
+        if not tool_results:
+            return StandardToolResponse(
+                status="success",
+                tool_name="generate_summary",
+                data={"summary": EMPTY_RESULTS_SUMMARY},
+                summary=EMPTY_RESULTS_SUMMARY,
+                metrics=StandardMetrics(
+                    items_processed=0,
+                    execution_time_ms=int((time.time() - start_time) * 1000)
+                )
+            )
+        
         if not settings.OPENAI_API_KEY:
             return StandardToolResponse(
                 status="error",
@@ -40,41 +301,34 @@ def generate_summary(tool_results: Any) -> StandardToolResponse:
                 )
             )
         
-        llm = ChatOpenAI(
-            model=settings.OPENAI_MODEL,
-            temperature=0.2,
-            api_key=settings.OPENAI_API_KEY,
-            base_url=settings.OPENAI_BASE_URL
+        # A bare string result is the whole input, so it gets the looser priority limits
+        prompt_results = _truncate_for_prompt(tool_results, priority=isinstance(tool_results, str))
+        # Compact JSON: indentation is tokenized by the model without improving the summary
+        prompt_results, prompt_data = _fit_to_budget(
+            prompt_results, serialization.dumps(prompt_results, default=str)
         )
+        model = _select_summary_model(prompt_data)
+        # Hash a sorted-key serialization so reordered but identical results still hit the cache
+        cache_key = _summary_cache_key(model, serialization.dumps(prompt_results, default=str, sort_keys=True))
         
-        system_prompt = SystemMessage(content="""
-        You are an expert code analysis assistant. Analyze the repository analysis results provided and create a clear, comprehensive summary.
-        
-        Focus on:
-        - Key findings and insights
-        - Security issues if any
-        - Code quality observations
-        - Actionable recommendations
-        
-        Provide a clear, readable summary that would be useful for developers and stakeholders.
-        """)
-        
-        human_prompt = HumanMessage(content=f"""
-        Please analyze and summarize the following repository analysis results:
-
-        {json.dumps(tool_results, indent=2, default=str)}
-        """)
-                
-        logger.info("Sending summary request to AI")
-        response = llm.invoke([system_prompt, human_prompt])
+        summary_text = _get_cached_summary(cache_key)
+        if summary_text is not None:
+            logger.info("Returning cached summary for identical tool results")
+        else:
+            llm = _get_llm(model)
+            
+            logger.info(f"Sending summary request to AI using {model}")
+            response = await llm.ainvoke([*SUMMARY_PROMPT_PREFIX, HumanMessage(content=prompt_data)])
+            summary_text = response.content
+            _store_cached_summary(cache_key, summary_text)
         
         execution_time_ms = int((time.time() - start_time) * 1000)
         
         result = StandardToolResponse(
             status="success",
             tool_name="generate_summary",
-            data={"summary": response.content},
-            summary=response.content[:200] + "..." if len(response.content) > 200 else response.content,
+            data={"summary": summary_text},
+            summary=summary_text[:200] + "..." if len(summary_text) > 200 else summary_text,
             metrics=StandardMetrics(
                 items_processed=len(tool_results) if isinstance(tool_results, dict) else 1,
                 execution_time_ms=execution_time_ms
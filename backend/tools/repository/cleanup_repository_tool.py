@@ -2,6 +2,7 @@ import os
 import shutil
 import stat
 import time
+import platform
 import subprocess
 from langchain_core.tools import tool
 from utils.logging_config import get_logger
@@ -11,6 +12,49 @@ from models.api_models import StandardToolResponse
 
 logger = get_logger(__name__)
 
+_IS_WINDOWS = platform.system() == "Windows"
+
+def _iter_file_sizes(path: str):
+    """Yield (file_path, size) for every file under path using os.scandir's cached stat results."""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _iter_file_sizes(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    yield entry.path, entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                pass
+
+def _remaining_size(file_sizes) -> int:
+    """Sum the sizes of files from an earlier scan that still exist, without walking the tree again."""
+    remaining = 0
+    for file_path, _ in file_sizes:
+        try:
+            remaining += os.path.getsize(file_path)
+        except OSError:
+            pass
+    return remaining
+
+def _remove_writable(remove, path: str) -> None:
+    """Remove path, clearing its read-only bit and retrying if the first attempt is denied."""
+    try:
+        remove(path)
+    except PermissionError:
+        os.chmod(path, stat.S_IWRITE)
+        remove(path)
+
+def _force_rmtree(path: str) -> None:
+    """Delete a directory tree in one bottom-up pass without restarting the traversal on failures."""
+    for root, dirs, files in os.walk(path, topdown=False):
+        for name in files:
+            _remove_writable(os.unlink, os.path.join(root, name))
+        for name in dirs:
+            dir_path = os.path.join(root, name)
+            # os.walk lists symlinks to directories under dirs without descending into them
+            _remove_writable(os.unlink if os.path.islink(dir_path) else os.rmdir, dir_path)
+    _remove_writable(os.rmdir, path)
+
 @tool_category("repository")
 @tool
 def cleanup_repository(repository_path: str) -> StandardToolResponse:
@@ -42,176 +86,105 @@ def cleanup_repository(repository_path: str) -> StandardToolResponse:
     logger.info(f"Cleaning up repository at {repository_path}")
     
     # Calculate directory size before cleanup for metrics
-    initial_size = 0
     try:
-        for dirpath, dirnames, filenames in os.walk(repository_path):
-            for f in filenames:
-                fp = os.path.join(dirpath, f)
-                try:
-                    initial_size += os.path.getsize(fp)
-                except (OSError, IOError):
-                    pass
+        file_sizes = list(_iter_file_sizes(repository_path))
     except Exception:
-        initial_size = 0
+        file_sizes = []
+    initial_size = sum(size for _, size in file_sizes)
+    initial_size_mb = round(initial_size / (1024 * 1024), 2)
+    warnings = []
+    
+    def build_cleaned_response(cleanup_method: str) -> StandardToolResponse:
+        """Build the success response shared by every cleanup method."""
+        return response_builder.build_success(
+            data={
+                "path": repository_path,
+                "cleanup_method": cleanup_method,
+                "freed_space_bytes": initial_size,
+                "freed_space_mb": initial_size_mb
+            },
+            summary=f"Repository cleaned up successfully using {cleanup_method} (freed {initial_size_mb} MB)",
+            metrics={
+                "items_processed": 1,
+                "files_analyzed": 0  # This is cleanup, not analysis
+            },
+            warnings=warnings or None
+        )
     
     def handle_remove_readonly(func, path, exc):
         """Handle read-only files on Windows."""
         try:
-            # Make the file/directory writable
+            # shutil.rmtree calls this once per failing entry, so only that path needs fixing
             os.chmod(path, stat.S_IWRITE)
-            # For directories, also make all contents writable
-            if os.path.isdir(path):
-                for root, dirs, files in os.walk(path):
-                    for d in dirs:
-                        try:
-                            os.chmod(os.path.join(root, d), stat.S_IWRITE)
-                        except:
-                            pass
-                    for f in files:
-                        try:
-                            os.chmod(os.path.join(root, f), stat.S_IWRITE)
-                        except:
-                            pass
             func(path)
         except Exception:
             pass
     
     cleanup_method = None
-    warnings = []
     
-    # Method 1: Try shutil.rmtree with error handler
+    # Method 1: Remove everything in a single bottom-up pass
     try:
-        shutil.rmtree(repository_path, onerror=handle_remove_readonly)
+        _force_rmtree(repository_path)
         if not os.path.exists(repository_path):
-            cleanup_method = "shutil.rmtree"
+            cleanup_method = "bottom-up remove"
             logger.info(f"Successfully cleaned up repository at {repository_path}")
             
-            return response_builder.build_success(
-                data={
-                    "path": repository_path,
-                    "cleanup_method": cleanup_method,
-                    "freed_space_bytes": initial_size,
-                    "freed_space_mb": round(initial_size / (1024 * 1024), 2)
-                },
-                summary=f"Repository cleaned up successfully using {cleanup_method} (freed {round(initial_size / (1024 * 1024), 2)} MB)",
-                metrics={
-                    "items_processed": 1,
-                    "files_analyzed": 0  # This is cleanup, not analysis
-                }
-            )
+            return build_cleaned_response(cleanup_method)
     except Exception as e:
         warnings.append(f"Initial cleanup attempt failed: {e}")
         logger.warning(f"Initial cleanup attempt failed: {e}")
     
-    # Method 2: Try to make everything writable first, then delete
+    # Method 2: Retry with shutil.rmtree, fixing up whatever still fails
     try:
-        for root, dirs, files in os.walk(repository_path):
-            for d in dirs:
-                try:
-                    os.chmod(os.path.join(root, d), stat.S_IWRITE)
-                except:
-                    pass
-            for f in files:
-                try:
-                    os.chmod(os.path.join(root, f), stat.S_IWRITE)
-                except:
-                    pass
-        
-        # Small delay to let Windows release file handles
-        time.sleep(0.1)
-        shutil.rmtree(repository_path)
+        if _IS_WINDOWS:
+            # Small delay to let Windows release file handles
+            time.sleep(0.1)
+        shutil.rmtree(repository_path, onerror=handle_remove_readonly)
         
         if not os.path.exists(repository_path):
-            cleanup_method = "chmod + shutil.rmtree"
+            cleanup_method = "shutil.rmtree"
             logger.info(f"Successfully cleaned up repository at {repository_path} (second attempt)")
             
-            return response_builder.build_success(
-                data={
-                    "path": repository_path,
-                    "cleanup_method": cleanup_method,
-                    "freed_space_bytes": initial_size,
-                    "freed_space_mb": round(initial_size / (1024 * 1024), 2)
-                },
-                summary=f"Repository cleaned up successfully using {cleanup_method} (freed {round(initial_size / (1024 * 1024), 2)} MB)",
-                metrics={
-                    "items_processed": 1,
-                    "files_analyzed": 0
-                },
-                warnings=warnings
-            )
+            return build_cleaned_response(cleanup_method)
     except Exception as e:
         warnings.append(f"Second cleanup attempt failed: {e}")
         logger.warning(f"Second cleanup attempt failed: {e}")
     
-    # Method 3: Try Windows-specific rmdir command
-    try:
-        result = subprocess.run(['rmdir', '/s', '/q', repository_path], 
-                              shell=True, check=False, capture_output=True, text=True)
-        if not os.path.exists(repository_path):
-            cleanup_method = "Windows rmdir"
-            logger.info(f"Successfully cleaned up repository at {repository_path} (rmdir)")
+    # Methods 3 and 4 shell out to Windows-only commands, so skip them elsewhere
+    if _IS_WINDOWS:
+        # Method 3: Try Windows-specific rmdir command
+        try:
+            result = subprocess.run(['cmd', '/c', 'rmdir', '/s', '/q', repository_path],
+                                  check=False, capture_output=True, text=True)
+            if not os.path.exists(repository_path):
+                cleanup_method = "Windows rmdir"
+                logger.info(f"Successfully cleaned up repository at {repository_path} (rmdir)")
             
-            return response_builder.build_success(
-                data={
-                    "path": repository_path,
-                    "cleanup_method": cleanup_method,
-                    "freed_space_bytes": initial_size,
-                    "freed_space_mb": round(initial_size / (1024 * 1024), 2)
-                },
-                summary=f"Repository cleaned up successfully using {cleanup_method} (freed {round(initial_size / (1024 * 1024), 2)} MB)",
-                metrics={
-                    "items_processed": 1,
-                    "files_analyzed": 0
-                },
-                warnings=warnings
-            )
-    except Exception as e:
-        warnings.append(f"rmdir cleanup attempt failed: {e}")
-        logger.warning(f"rmdir cleanup attempt failed: {e}")
+                return build_cleaned_response(cleanup_method)
+        except Exception as e:
+            warnings.append(f"rmdir cleanup attempt failed: {e}")
+            logger.warning(f"rmdir cleanup attempt failed: {e}")
     
-    # Method 4: Try PowerShell Remove-Item (more powerful than rmdir)
-    try:
-        ps_command = f'Remove-Item -Path "{repository_path}" -Recurse -Force -ErrorAction SilentlyContinue'
-        result = subprocess.run(['powershell', '-Command', ps_command], 
-                              check=False, capture_output=True, text=True)
-        if not os.path.exists(repository_path):
-            cleanup_method = "PowerShell Remove-Item"
-            logger.info(f"Successfully cleaned up repository at {repository_path} (PowerShell)")
+        # Method 4: Try PowerShell Remove-Item (more powerful than rmdir)
+        try:
+            ps_command = f'Remove-Item -Path "{repository_path}" -Recurse -Force -ErrorAction SilentlyContinue'
+            result = subprocess.run(['powershell', '-Command', ps_command], 
+                                  check=False, capture_output=True, text=True)
+            if not os.path.exists(repository_path):
+                cleanup_method = "PowerShell Remove-Item"
+                logger.info(f"Successfully cleaned up repository at {repository_path} (PowerShell)")
             
-            return response_builder.build_success(
-                data={
-                    "path": repository_path,
-                    "cleanup_method": cleanup_method,
-                    "freed_space_bytes": initial_size,
-                    "freed_space_mb": round(initial_size / (1024 * 1024), 2)
-                },
-                summary=f"Repository cleaned up successfully using {cleanup_method} (freed {round(initial_size / (1024 * 1024), 2)} MB)",
-                metrics={
-                    "items_processed": 1,
-                    "files_analyzed": 0
-                },
-                warnings=warnings
-            )
-    except Exception as e:
-        warnings.append(f"PowerShell cleanup attempt failed: {e}")
-        logger.warning(f"PowerShell cleanup attempt failed: {e}")
+                return build_cleaned_response(cleanup_method)
+        except Exception as e:
+            warnings.append(f"PowerShell cleanup attempt failed: {e}")
+            logger.warning(f"PowerShell cleanup attempt failed: {e}")
     
     # If all methods fail, return partial success or error
     if os.path.exists(repository_path):
         logger.warning(f"Could not fully cleanup directory: {repository_path}")
         
         # Check if directory is smaller (partial cleanup)
-        remaining_size = 0
-        try:
-            for dirpath, dirnames, filenames in os.walk(repository_path):
-                for f in filenames:
-                    fp = os.path.join(dirpath, f)
-                    try:
-                        remaining_size += os.path.getsize(fp)
-                    except (OSError, IOError):
-                        pass
-        except Exception:
-            remaining_size = initial_size
+        remaining_size = _remaining_size(file_sizes)
         
         freed_space = initial_size - remaining_size
         
@@ -244,7 +217,7 @@ def cleanup_repository(repository_path: str) -> StandardToolResponse:
                 data={
                     "path": repository_path,
                     "initial_size_bytes": initial_size,
-                    "initial_size_mb": round(initial_size / (1024 * 1024), 2),
+                    "initial_size_mb": initial_size_mb,
                     "warnings": warnings
                 }
             )
@@ -255,9 +228,9 @@ def cleanup_repository(repository_path: str) -> StandardToolResponse:
                 "path": repository_path,
                 "cleanup_method": "unknown",
                 "freed_space_bytes": initial_size,
-                "freed_space_mb": round(initial_size / (1024 * 1024), 2)
+                "freed_space_mb": initial_size_mb
             },
-            summary=f"Repository cleanup completed (freed {round(initial_size / (1024 * 1024), 2)} MB)",
+            summary=f"Repository cleanup completed (freed {initial_size_mb} MB)",
             metrics={
                 "items_processed": 1,
                 "files_analyzed": 0
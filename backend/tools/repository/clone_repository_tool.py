@@ -1,6 +1,6 @@
 import tempfile
+import subprocess
 from langchain_core.tools import tool
-from git import Repo
 from pathlib import Path
 from config.settings import settings
 from utils.logging_config import get_logger
@@ -10,6 +10,23 @@ from models.api_models import StandardToolResponse
 
 logger = get_logger(__name__)
 
+# Partial clone: fetch commits and trees but only the blobs needed for the checkout,
+# and skip tags which no downstream tool uses
+CLONE_OPTIONS = ("--filter=blob:none", "--no-tags")
+
+def _run_git(*args: str) -> str:
+    """Run a git command and return its stripped stdout, raising on failure."""
+    result = subprocess.run(
+        ["git", *args],
+        capture_output=True,
+        text=True,
+        encoding='utf-8',
+        errors='replace'
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+    return result.stdout.strip()
+
 @tool_category("repository")
 @tool
 def clone_repository(repository_url: str, branch: str = None) -> StandardToolResponse:
@@ -40,18 +57,18 @@ def clone_repository(repository_url: str, branch: str = None) -> StandardToolRes
         if branch:
             try:
                 logger.info(f"Cloning repository with specific branch: {branch}")
-                repo = Repo.clone_from(repository_url, temp_dir, branch=branch)
+                _run_git("clone", *CLONE_OPTIONS, "--branch", branch, repository_url, temp_dir)
                 final_branch = branch
                 logger.info(f"Successfully cloned directly to branch: {branch}")
             except Exception as e:
                 logger.warning(f"Failed to clone branch {branch}: {e}")
                 logger.info(f"Falling back to default branch clone")
-                repo = Repo.clone_from(repository_url, temp_dir)
-                final_branch = repo.active_branch.name
+                _run_git("clone", *CLONE_OPTIONS, repository_url, temp_dir)
+                final_branch = _run_git("-C", temp_dir, "rev-parse", "--abbrev-ref", "HEAD")
         else:
             logger.info(f"Cloning repository with default branch")
-            repo = Repo.clone_from(repository_url, temp_dir)
-            final_branch = repo.active_branch.name
+            _run_git("clone", *CLONE_OPTIONS, repository_url, temp_dir)
+            final_branch = _run_git("-C", temp_dir, "rev-parse", "--abbrev-ref", "HEAD")
             
         logger.info(f"Clone completed on branch: {final_branch}")
         
@@ -61,8 +78,8 @@ def clone_repository(repository_url: str, branch: str = None) -> StandardToolRes
             "repository_name": Path(repository_url).name.replace('.git', ''),
             "branch": final_branch,
             "requested_branch": branch,
-            "commit_count": len(list(repo.iter_commits())),
-            "last_commit": repo.head.commit.hexsha[:8],
+            "commit_count": int(_run_git("-C", temp_dir, "rev-list", "--count", "HEAD")),
+            "last_commit": _run_git("-C", temp_dir, "rev-parse", "--short=8", "HEAD"),
             "repository_url": repository_url
         }
         
@@ -1,13 +1,98 @@
+import asyncio
+import hashlib
+import os
+import shutil
 import subprocess
-from langchain_core.tools import tool
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from utils.async_tool_decorator import async_tool
 from utils.logging_config import get_logger
 from utils.tool_metadata_decorator import tool_category
 
 logger = get_logger(__name__)
 
+# Bounded in-memory cache of scan output keyed by a hash of the module's Go inputs
+SCAN_CACHE_SIZE = 32
+# The vulnerability database changes over time, so cached scans expire
+SCAN_CACHE_TTL_SECONDS = 60 * 60
+_scan_cache: "OrderedDict[str, Tuple[float, int, str]]" = OrderedDict()
+_scan_cache_lock = threading.Lock()
+
+# Directories that never contain sources govulncheck analyzes
+SCAN_SKIP_DIRS = frozenset({'.git', 'node_modules', 'testdata'})
+
+# govulncheck version banner, cached only once a probe succeeds so a slow or failed probe is retried
+_govulncheck_version_banner: Optional[str] = None
+
+def _govulncheck_version() -> Optional[str]:
+    """Return the govulncheck version banner, probed until it first succeeds, or None if it is unavailable."""
+    global _govulncheck_version_banner
+    if _govulncheck_version_banner is not None:
+        return _govulncheck_version_banner
+    # PATH lookup first so a missing binary costs no process spawn
+    if shutil.which("govulncheck") is None:
+        return None
+    try:
+        result = subprocess.run(
+            ["govulncheck", "-version"],
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            timeout=10
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    _govulncheck_version_banner = result.stdout.strip()
+    return _govulncheck_version_banner
+
+def _scan_cache_key(repository_path: str, version: str) -> str:
+    """Hash go.mod, go.sum and every .go source so any dependency or code change misses the cache."""
+    digest = hashlib.blake2b(version.encode("utf-8"), digest_size=16)
+    for root, dirs, files in os.walk(repository_path):
+        dirs[:] = sorted(d for d in dirs if d not in SCAN_SKIP_DIRS)
+        for file in sorted(files):
+            if file.endswith('.go') or file in ('go.mod', 'go.sum'):
+                file_path = os.path.join(root, file)
+                digest.update(os.path.relpath(file_path, repository_path).encode("utf-8"))
+                with open(file_path, 'rb') as f:
+                    digest.update(f.read())
+    return digest.hexdigest()
+
+def _get_cached_scan(key: str) -> Optional[Tuple[int, str]]:
+    """Return a fresh cached (returncode, output) pair, dropping it if it has expired."""
+    with _scan_cache_lock:
+        entry = _scan_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, returncode, output = entry
+        if time.monotonic() - stored_at > SCAN_CACHE_TTL_SECONDS:
+            del _scan_cache[key]
+            return None
+        _scan_cache.move_to_end(key)
+        return returncode, output
+
+def _store_cached_scan(key: str, returncode: int, output: str) -> None:
+    """Cache a completed scan, evicting the least recently used entry when full."""
+    with _scan_cache_lock:
+        _scan_cache[key] = (time.monotonic(), returncode, output)
+        _scan_cache.move_to_end(key)
+        while len(_scan_cache) > SCAN_CACHE_SIZE:
+            _scan_cache.popitem(last=False)
+
+# Upper bound on a single govulncheck run
+SCAN_TIMEOUT_SECONDS = 120
+
+# govulncheck exits 0 when clean and 3 when vulnerabilities were found; anything else is a failure
+SCAN_COMPLETED_RETURNCODES = (0, 3)
+
 @tool_category("security")
-@tool
-def scan_go_vulnerabilities(repository_path: str) -> str:
+@async_tool
+async def scan_go_vulnerabilities(repository_path: str) -> str:
     """Scan Go repository using govulncheck.
 
     Scan Go repository for security vulnerabilities using govulncheck.
@@ -24,35 +109,47 @@ def scan_go_vulnerabilities(repository_path: str) -> str:
     logger.info(f"Scanning Go vulnerabilities at {repository_path}")
     
     try:
-        result = subprocess.run(
-            ["govulncheck", "-version"],
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            timeout=10
-        )
-        
-        if result.returncode != 0:
+        # A successful probe is cached, so later calls spawn no process
+        version = await asyncio.to_thread(_govulncheck_version)
+        if version is None:
             logger.warning("govulncheck not available")
             return "Go vulnerability scanning skipped: govulncheck tool not available"
         
-        logger.info("Running govulncheck scan...")
-
-        scan_result = subprocess.run(
-            ["govulncheck", "./..."],
-            cwd=repository_path,
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='replace',
-            timeout=120
-        )
+        try:
+            cache_key = await asyncio.to_thread(_scan_cache_key, repository_path, version)
+        except OSError as e:
+            # Unreadable files (e.g. dangling symlinks) only cost the cache, not the scan
+            logger.warning(f"Could not hash Go sources for scan cache, scanning uncached: {e}")
+            cache_key = None
         
-        output = scan_result.stdout
-        logger.info("Output: " + output)
+        cached = _get_cached_scan(cache_key) if cache_key is not None else None
+        if cached is not None:
+            logger.info("Using cached govulncheck result - Go sources unchanged")
+            returncode, output = cached
+        else:
+            logger.info("Running govulncheck scan...")
+
+            # Blocking subprocess in a worker thread rather than asyncio subprocesses, which the
+            # selector event loop uvicorn uses on Windows with reload enabled does not support
+            scan_result = await asyncio.to_thread(
+                subprocess.run,
+                ["govulncheck", "./..."],
+                cwd=repository_path,
+                capture_output=True,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                timeout=SCAN_TIMEOUT_SECONDS
+            )
+            
+            returncode = scan_result.returncode
+            output = scan_result.stdout
+            logger.info("Output: " + output)
+            
+            if cache_key is not None and returncode in SCAN_COMPLETED_RETURNCODES:
+                _store_cached_scan(cache_key, returncode, output)
         
-        if scan_result.returncode == 0:
+        if returncode == 0:
             logger.info("govulncheck completed - no vulnerabilities found")
             return "Go Security Scan: No vulnerabilities found in Go dependencies. The project appears secure."
         else:
@@ -11,14 +11,12 @@ def async_tool(func=None, **tool_kwargs):
     Usage: @async_tool instead of @tool for async functions.
     """
     def decorator(f):
-        # Preserve any existing metadata from other decorators (like @tool_category)
-        metadata = {}
-        for attr_name in dir(f):
-            if not attr_name.startswith('_') and not callable(getattr(f, attr_name)):
-                try:
-                    metadata[attr_name] = getattr(f, attr_name)
-                except (AttributeError, TypeError):
-                    pass
+        # Preserve any existing metadata from other decorators (like @tool_category);
+        # those are plain attributes in the function's __dict__, so no dir()/getattr scan is needed
+        metadata = {
+            key: value for key, value in vars(f).items()
+            if not key.startswith('_') and not callable(value)
+        }
         
         # Create the LangChain tool using the standard decorator
         langchain_tool = tool(**tool_kwargs)(f)
@@ -37,4 +35,8 @@ def async_tool(func=None, **tool_kwargs):
     if func is not None:
         return decorator(func)
     else:
-        return decorator 
+        return decorator
+
+def is_async_tool(tool) -> bool:
+    """Return True if the tool was created with @async_tool and should be awaited."""
+    return getattr(tool, "_is_async_tool", False)
@@ -1,13 +1,90 @@
+import hashlib
 import os
+import re
+import signal
 import subprocess
 import shutil
-from typing import Dict, Optional
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from config.settings import settings
 from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Only the tail of go command output is kept; errors are reported last
+MAX_OUTPUT_LINES = 5000
+OUTPUT_BUFFER_BYTES = 64 * 1024
+
+# Coarsest file timestamp resolution we guard against (FAT/HFS+ style filesystems)
+MTIME_GRANULARITY_SECONDS = 2
+
+# Bounded cache of go build failures keyed by working tree state and proposed fixes, so
+# re-validating an identical broken fix returns immediately instead of rebuilding
+FAILED_BUILD_CACHE_SIZE = 64
+FAILED_BUILD_CACHE_TTL_SECONDS = 10 * 60
+_failed_build_cache: "OrderedDict[str, Tuple[float, BuildResult]]" = OrderedDict()
+_failed_build_cache_lock = threading.Lock()
+
+# Only failures that report compiler diagnostics (file.go:line[:col]: ...) are deterministic enough to cache
+GO_COMPILE_ERROR_PATTERN = re.compile(r'^\S+\.go:\d+(?::\d+)?: ', re.MULTILINE)
+# Module download, network, disk and process failures depend on the environment, not the code
+GO_ENVIRONMENT_ERROR_PATTERN = re.compile(
+    r'timed out|i/o timeout|dial tcp|connection (?:refused|reset)|no such host|TLS handshake|proxyconnect'
+    r'|unexpected EOF|reading https?://|Get "https?://|no space left on device|too many open files'
+    r'|permission denied|read-only file system|cannot allocate memory|signal: killed',
+    re.IGNORECASE
+)
+
+# Go import declarations: an import spec (optionally aliased), the import keyword, and the
+# top-level declarations that end the import section of a file
+GO_IMPORT_SPEC_PATTERN = re.compile(r'(?:[\w.]+\s+)?"([^"]+)"')
+GO_IMPORT_KEYWORD_PATTERN = re.compile(r'import\b')
+GO_DECL_PATTERN = re.compile(r'(?:func|type|var|const)\b')
+
+def _go_imports(source: str) -> Optional[frozenset]:
+    """Return the set of import paths declared in a Go source file, or None if they cannot be parsed reliably."""
+    imports = set()
+    in_block = False
+    for raw_line in source.splitlines():
+        line = raw_line.split("//", 1)[0].strip()
+        if "/*" in line:
+            # Block comments can hide or fake import specs
+            return None
+        if in_block:
+            if line == ")":
+                in_block = False
+            elif line:
+                match = GO_IMPORT_SPEC_PATTERN.fullmatch(line)
+                if match is None:
+                    return None
+                imports.add(match.group(1))
+        elif GO_IMPORT_KEYWORD_PATTERN.match(line):
+            spec = line[len("import"):].strip()
+            if spec == "(":
+                in_block = True
+                continue
+            match = GO_IMPORT_SPEC_PATTERN.fullmatch(spec)
+            if match is None:
+                return None
+            imports.add(match.group(1))
+        elif GO_DECL_PATTERN.match(line):
+            # Imports must precede all other declarations
+            break
+    return None if in_block else frozenset(imports)
+
+def _write_bytes(path: str, data: bytes):
+    """Replace a file's contents with raw os.write calls, skipping buffered file object setup."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
 @dataclass
 class BuildResult:
     success: bool
@@ -16,11 +93,49 @@ class BuildResult:
     duration: float = 0.0
     updated_go_sum: Optional[str] = None
 
+def _is_code_failure(result: BuildResult) -> bool:
+    """Check whether a failed build was caused by the code itself rather than the environment."""
+    output = result.build_output or ""
+    if GO_ENVIRONMENT_ERROR_PATTERN.search(result.error_message or "") or GO_ENVIRONMENT_ERROR_PATTERN.search(output):
+        return False
+    return GO_COMPILE_ERROR_PATTERN.search(output) is not None
+
+def _get_cached_build_failure(key: str) -> Optional[BuildResult]:
+    """Return a cached build failure that has not expired, marking it as recently used."""
+    with _failed_build_cache_lock:
+        entry = _failed_build_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if time.monotonic() - stored_at > FAILED_BUILD_CACHE_TTL_SECONDS:
+            del _failed_build_cache[key]
+            return None
+        _failed_build_cache.move_to_end(key)
+        return result
+
+def _store_cached_build_failure(key: str, result: BuildResult):
+    """Cache a build failure, evicting the least recently used entry when full."""
+    with _failed_build_cache_lock:
+        _failed_build_cache[key] = (time.monotonic(), result)
+        _failed_build_cache.move_to_end(key)
+        while len(_failed_build_cache) > FAILED_BUILD_CACHE_SIZE:
+            _failed_build_cache.popitem(last=False)
+
 class BuildValidator:
     """Service for validating fixes by running go build."""
     
     def __init__(self):
         self.timeout = 120
+        self._go_env = self._build_go_env()
+    
+    @staticmethod
+    def _build_go_env() -> Dict[str, str]:
+        """Environment for go commands, sharing build and module caches across validations when configured."""
+        env = dict(os.environ)
+        if settings.GO_CACHE_DIR:
+            env["GOCACHE"] = os.path.join(settings.GO_CACHE_DIR, "build")
+            env["GOMODCACHE"] = os.path.join(settings.GO_CACHE_DIR, "mod")
+        return env
     
     def validate_fixes(self, repo_path: str, updated_files: Dict[str, str]) -> BuildResult:
         """
@@ -34,42 +149,67 @@ class BuildValidator:
             BuildResult indicating success/failure
         """
         backup_files = {}
+        created_files = []
         try:
             logger.info(f"Validating fixes in repository: {repo_path}")
             
+            # Encode once; the same bytes feed the cache key and the file writes
+            encoded_files = {file_path: content.encode('utf-8') for file_path, content in updated_files.items()}
+            
             # Create backup of files we're about to modify
+            # Opening directly instead of checking existence first saves a stat per file;
+            # per-file debug logs use lazy %-args so nothing is formatted when debug is off
             for file_path in updated_files.keys():
                 full_path = os.path.join(repo_path, file_path)
-                if os.path.exists(full_path):
-                    try:
-                        with open(full_path, 'r', encoding='utf-8') as f:
-                            backup_files[file_path] = f.read()
-                        logger.debug(f"Backed up original content of {file_path}")
-                    except Exception as e:
-                        logger.warning(f"Could not backup {file_path}: {e}")
+                try:
+                    with open(full_path, 'r', encoding='utf-8') as f:
+                        backup_files[file_path] = f.read()
+                    logger.debug("Backed up original content of %s", file_path)
+                except FileNotFoundError:
+                    # Removed again on restore so a failed fix leaves no new files behind
+                    created_files.append(file_path)
+                except Exception as e:
+                    logger.warning(f"Could not backup {file_path}: {e}")
             
             # Always backup go.sum if it exists (go mod tidy may modify it)
             original_go_sum = None
+            original_go_sum_stat = None
             go_sum_path = os.path.join(repo_path, "go.sum")
-            if os.path.exists(go_sum_path):
-                try:
-                    with open(go_sum_path, 'r', encoding='utf-8') as f:
-                        original_go_sum = f.read()
-                        # Add to backup_files so it gets restored on failure
-                        if "go.sum" not in backup_files:
-                            backup_files["go.sum"] = original_go_sum
-                            logger.debug("Backed up original go.sum for restoration")
-                except Exception as e:
-                    logger.warning(f"Could not read original go.sum: {e}")
+            validation_started_at = time.time()
+            try:
+                with open(go_sum_path, 'r', encoding='utf-8') as f:
+                    original_go_sum = f.read()
+                    original_go_sum_stat = os.fstat(f.fileno())
+                    # Add to backup_files so it gets restored on failure
+                    if "go.sum" not in backup_files:
+                        backup_files["go.sum"] = original_go_sum
+                        logger.debug("Backed up original go.sum for restoration")
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Could not read original go.sum: {e}")
+            
+            # The key is only worth computing when there is a cached failure it could match
+            cache_key = None
+            if _failed_build_cache:
+                cache_key = self._validation_cache_key(repo_path, backup_files, encoded_files)
+                cached_result = _get_cached_build_failure(cache_key) if cache_key is not None else None
+                if cached_result is not None:
+                    logger.info("Returning cached go build failure for identical fixes")
+                    return cached_result
             
             # Apply the fixes to the repository
-            self._apply_fixes(repo_path, updated_files)
+            self._apply_fixes(repo_path, encoded_files)
             
-            # Run go mod tidy first
-            tidy_result = self._run_go_mod_tidy(repo_path)
+            # Run go mod tidy first, unless the fixes leave module requirements untouched
+            if self._needs_tidy(backup_files, updated_files):
+                tidy_result = self._run_go_mod_tidy(repo_path)
+            else:
+                logger.info("Skipping go mod tidy - no go.mod, go.sum or import changes")
+                tidy_result = BuildResult(success=True, build_output="")
             if not tidy_result.success:
                 # Restore backups on failure
-                self._restore_backups(repo_path, backup_files)
+                self._restore_backups(repo_path, backup_files, created_files)
                 return BuildResult(
                     success=False,
                     build_output=tidy_result.build_output,
@@ -81,11 +221,21 @@ class BuildValidator:
             
             # If validation failed, restore backups
             if not build_result.success:
-                self._restore_backups(repo_path, backup_files)
+                self._restore_backups(repo_path, backup_files, created_files)
+                # Compile errors are deterministic for the same tree and fixes; environment failures are not
+                if _is_code_failure(build_result):
+                    if cache_key is None:
+                        cache_key = self._validation_cache_key(repo_path, backup_files, encoded_files)
+                    if cache_key is not None:
+                        _store_cached_build_failure(cache_key, build_result)
                 return build_result
             
             # If validation succeeded, capture updated go.sum content if it changed
-            if os.path.exists(go_sum_path):
+            try:
+                go_sum_stat = os.stat(go_sum_path)
+            except FileNotFoundError:
+                go_sum_stat = None
+            if go_sum_stat is not None and not self._file_untouched(original_go_sum_stat, go_sum_stat, validation_started_at):
                 try:
                     with open(go_sum_path, 'r', encoding='utf-8') as f:
                         updated_go_sum = f.read()
@@ -105,15 +255,83 @@ class BuildValidator:
         except Exception as e:
             logger.error(f"Build validation failed with exception: {e}")
             # Restore backups on exception
-            self._restore_backups(repo_path, backup_files)
+            self._restore_backups(repo_path, backup_files, created_files)
             return BuildResult(
                 success=False,
                 build_output="",
                 error_message=f"Validation exception: {str(e)}"
             )
     
-    def _restore_backups(self, repo_path: str, backup_files: Dict[str, str]):
-        """Restore backed up files in case of validation failure."""
+    @staticmethod
+    def _file_untouched(before: Optional[os.stat_result], after: os.stat_result, started_at: float) -> bool:
+        """Check from stat alone that a file was not rewritten since validation started, so it need not be re-read."""
+        if before is None:
+            return False
+        same_file = (before.st_ino, before.st_size, before.st_mtime_ns) == (after.st_ino, after.st_size, after.st_mtime_ns)
+        # Any write during validation leaves an mtime at or after the start, even with coarse timestamps
+        return same_file and after.st_mtime < started_at - MTIME_GRANULARITY_SECONDS
+    
+    def _validation_cache_key(self, repo_path: str, backup_files: Dict[str, str], encoded_files: Dict[str, bytes]) -> Optional[str]:
+        """Hash HEAD with the original and proposed content of the patched files; None when HEAD is unavailable."""
+        try:
+            head = subprocess.run(
+                ["git", "rev-parse", "HEAD"],
+                cwd=repo_path,
+                capture_output=True,
+                check=True,
+                timeout=10
+            ).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"Could not read HEAD for validation cache: {e}")
+            return None
+        
+        digest = hashlib.blake2b(head, digest_size=16)
+        for file_path in sorted(set(backup_files) | set(encoded_files)):
+            original = backup_files.get(file_path)
+            digest.update(file_path.encode('utf-8'))
+            # Distinguish a missing original from an empty one
+            digest.update(b"\0" if original is None else b"\1" + original.encode('utf-8'))
+            digest.update(b"\0")
+            digest.update(encoded_files.get(file_path, b""))
+            digest.update(b"\0")
+        return digest.hexdigest()
+    
+    def _needs_tidy(self, backup_files: Dict[str, str], updated_files: Dict[str, str]) -> bool:
+        """Check whether the fixes can change module requirements and so need go mod tidy."""
+        for file_path, new_content in updated_files.items():
+            file_name = os.path.basename(file_path)
+            if file_name in ("go.mod", "go.sum"):
+                return True
+            if file_name.endswith(".go"):
+                new_imports = _go_imports(new_content)
+                old_imports = _go_imports(backup_files.get(file_path, ""))
+                # Tidy whenever either side's imports could not be parsed reliably
+                if new_imports is None or old_imports is None or new_imports != old_imports:
+                    return True
+        return False
+    
+    @staticmethod
+    def _file_matches(path: str, content: bytes) -> bool:
+        """Check whether a file already holds exactly these bytes, reading it only when the size matches."""
+        try:
+            if os.path.getsize(path) != len(content):
+                return False
+            with open(path, 'rb') as f:
+                return f.read() == content
+        except OSError:
+            return False
+    
+    def _restore_backups(self, repo_path: str, backup_files: Dict[str, str], created_files: List[str]):
+        """Restore backed up files and remove files the fixes created in case of validation failure."""
+        for file_path in created_files:
+            try:
+                os.remove(os.path.join(repo_path, file_path))
+                logger.debug("Removed %s created by the failed fixes", file_path)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.error(f"Failed to remove {file_path}: {e}")
+        
         if not backup_files:
             return
             
@@ -121,138 +339,121 @@ class BuildValidator:
         for file_path, original_content in backup_files.items():
             try:
                 full_path = os.path.join(repo_path, file_path)
-                with open(full_path, 'w', encoding='utf-8') as f:
-                    f.write(original_content)
-                logger.debug(f"Restored original content of {file_path}")
+                original_bytes = original_content.encode('utf-8')
+                # Leave files the failed run never changed alone, keeping their mtime for Go's build cache
+                if self._file_matches(full_path, original_bytes):
+                    continue
+                _write_bytes(full_path, original_bytes)
+                logger.debug("Restored original content of %s", file_path)
             except Exception as e:
                 logger.error(f"Failed to restore backup of {file_path}: {e}")
     
-    def _apply_fixes(self, repo_path: str, updated_files: Dict[str, str]):
-        """Apply fixes to the repository."""
-        logger.info(f"Applying {len(updated_files)} file updates")
+    def _apply_fixes(self, repo_path: str, encoded_files: Dict[str, bytes]):
+        """Apply UTF-8 encoded fixes to the repository."""
+        logger.info(f"Applying {len(encoded_files)} file updates")
         
-        for file_path, new_content in updated_files.items():
-            full_path = os.path.join(repo_path, file_path)
-            
-            # Create directory if it doesn't exist
-            dir_path = os.path.dirname(full_path)
-            if dir_path and not os.path.exists(dir_path):
+        # Create each parent directory once, not once per file in it; exist_ok makes a prior stat redundant
+        full_paths = {file_path: os.path.join(repo_path, file_path) for file_path in encoded_files}
+        for dir_path in {os.path.dirname(full_path) for full_path in full_paths.values()}:
+            if dir_path:
                 os.makedirs(dir_path, exist_ok=True)
+        
+        for file_path, new_content in encoded_files.items():
+            full_path = full_paths[file_path]
             
             # Write the updated content
             try:
-                with open(full_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
-                logger.debug(f"Applied fix to: {file_path}")
+                _write_bytes(full_path, new_content)
+                logger.debug("Applied fix to: %s", file_path)
             except Exception as e:
                 logger.error(f"Failed to apply fix to {file_path}: {e}")
                 raise
     
     def _run_go_mod_tidy(self, repo_path: str) -> BuildResult:
         """Run go mod tidy to clean up dependencies."""
-        logger.info("Running go mod tidy")
+        return self._run_go_command(repo_path, ["mod", "tidy"])
+    
+    def _run_go_build(self, repo_path: str) -> BuildResult:
+        """Run go build to validate the fixes."""
+        return self._run_go_command(repo_path, ["build", "./..."])
+    
+    @staticmethod
+    def _kill_process_tree(process: subprocess.Popen):
+        """Kill a process started with start_new_session and everything in its process group."""
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+                return
+            except (ProcessLookupError, PermissionError):
+                pass
+        process.kill()
+    
+    def _run_go_command(self, repo_path: str, args: List[str]) -> BuildResult:
+        """Run a go subcommand, keeping only the tail of its combined output."""
+        command = f"go {' '.join(args)}"
+        logger.info(f"Running {command}")
         
         try:
-            import time
             start_time = time.time()
             
-            result = subprocess.run(
-                ["go", "mod", "tidy"],
+            process = subprocess.Popen(
+                ["go", *args],
                 cwd=repo_path,
-                capture_output=True,
+                env=self._go_env,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
                 text=True,
                 encoding='utf-8',
                 errors='replace',
-                timeout=self.timeout
+                bufsize=OUTPUT_BUFFER_BYTES,
+                # Own process group so a timeout also kills compile/link children holding the pipe
+                start_new_session=True
             )
             
+            # Enforce the timeout from a timer so output can be streamed while waiting
+            timed_out = threading.Event()
+            def kill_on_timeout():
+                timed_out.set()
+                self._kill_process_tree(process)
+            
+            timer = threading.Timer(self.timeout, kill_on_timeout)
+            timer.start()
+            try:
+                output_lines = deque(process.stdout, maxlen=MAX_OUTPUT_LINES)
+                returncode = process.wait()
+            finally:
+                timer.cancel()
+                process.stdout.close()
+            
             duration = time.time() - start_time
+            output = "".join(output_lines)
             
-            if result.returncode == 0:
-                logger.info(f"go mod tidy completed successfully in {duration:.2f}s")
-                return BuildResult(
-                    success=True,
-                    build_output=result.stdout,
-                    duration=duration
-                )
-            else:
-                logger.warning(f"go mod tidy failed: {result.stderr}")
+            if timed_out.is_set():
+                error_msg = f"{command} timed out"
+                logger.error(error_msg)
                 return BuildResult(
                     success=False,
-                    build_output=result.stdout + "\n" + result.stderr,
-                    error_message=result.stderr,
+                    build_output=output,
+                    error_message=error_msg,
                     duration=duration
                 )
-                
-        except subprocess.TimeoutExpired:
-            error_msg = "go mod tidy timed out"
-            logger.error(error_msg)
-            return BuildResult(
-                success=False,
-                build_output="",
-                error_message=error_msg
-            )
-        except FileNotFoundError:
-            error_msg = "go command not found"
-            logger.error(error_msg)
-            return BuildResult(
-                success=False,
-                build_output="",
-                error_message=error_msg
-            )
-        except Exception as e:
-            error_msg = f"go mod tidy failed: {str(e)}"
-            logger.error(error_msg)
-            return BuildResult(
-                success=False,
-                build_output="",
-                error_message=error_msg
-            )
-    
-    def _run_go_build(self, repo_path: str) -> BuildResult:
-        """Run go build to validate the fixes."""
-        logger.info("Running go build ./...")
-        
-        try:
-            import time
-            start_time = time.time()
-            
-            result = subprocess.run(
-                ["go", "build", "./..."],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                timeout=self.timeout
-            )
             
-            duration = time.time() - start_time
-            
-            if result.returncode == 0:
-                logger.info(f"go build completed successfully in {duration:.2f}s")
+            if returncode == 0:
+                logger.info(f"{command} completed successfully in {duration:.2f}s")
                 return BuildResult(
                     success=True,
-                    build_output=result.stdout,
+                    build_output=output,
                     duration=duration
                 )
             else:
-                logger.warning(f"go build failed: {result.stderr}")
+                logger.warning(f"{command} failed: {output}")
                 return BuildResult(
                     success=False,
-                    build_output=result.stdout + "\n" + result.stderr,
-                    error_message=result.stderr,
+                    build_output=output,
+                    error_message=output,
                     duration=duration
                 )
                 
-        except subprocess.TimeoutExpired:
-            error_msg = "go build timed out"
-            logger.error(error_msg)
-            return BuildResult(
-                success=False,
-                build_output="",
-                error_message=error_msg
-            )
         except FileNotFoundError:
             error_msg = "go command not found"
             logger.error(error_msg)
@@ -262,11 +463,10 @@ class BuildValidator:
                 error_message=error_msg
             )
         except Exception as e:
-            error_msg = f"go build failed: {str(e)}"
+            error_msg = f"{command} failed: {str(e)}"
             logger.error(error_msg)
             return BuildResult(
                 success=False,
                 build_output="",
                 error_message=error_msg
-            ) 
-                
\ No newline at end of file
+            )
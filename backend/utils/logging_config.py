@@ -1,23 +1,55 @@
+import atexit
+import functools
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+# Background thread that writes queued records to the real handlers
+_queue_listener: Optional[QueueListener] = None
+
 def setup_logging(level: str = "INFO", log_format: Optional[str] = None) -> None:
+    global _queue_listener
+    
     if log_format is None:
         log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
     numeric_level = getattr(logging, level.upper(), logging.INFO)
     
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(log_format))
+    
+    # Callers only enqueue records; stdout writes happen on the listener thread
+    if _queue_listener is not None:
+        _queue_listener.stop()
+    log_queue = queue.SimpleQueue()
+    _queue_listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _queue_listener.start()
+    
+    # The queue handler only renders the message (with any traceback); the listener applies log_format
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    
     logging.basicConfig(
         level=numeric_level,
-        format=log_format,
         handlers=[
-            logging.StreamHandler(sys.stdout),
-        ]
+            queue_handler,
+        ],
+        force=True
     )
     
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("fastapi").setLevel(logging.INFO)
 
+def _stop_queue_listener() -> None:
+    """Flush queued records on interpreter exit."""
+    if _queue_listener is not None:
+        _queue_listener.stop()
+
+atexit.register(_stop_queue_listener)
+
+# Loggers live for the whole process, so each name is resolved through the logging manager once
+@functools.lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
     return logging.getLogger(name) 
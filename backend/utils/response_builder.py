@@ -5,7 +5,7 @@ This module provides utilities to wrap existing tool outputs into the standardiz
 response format, ensuring consistency across all tools while maintaining backward compatibility.
 """
 
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 import time
 
@@ -14,12 +14,79 @@ from utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Status and error type values used in built responses and status dispatch
+STATUS_SUCCESS = "success"
+STATUS_ERROR = "error"
+STATUS_PARTIAL_SUCCESS = "partial_success"
+STATUS_COMPLETED = "completed"
+STATUS_SKIPPED = "skipped"
+ERROR_TYPE_PARTIAL_FAILURE = "partial_failure"
+ERROR_TYPE_TOOL_EXECUTION = "tool_execution_error"
+
+# Statuses accepted by StandardToolResponse
+STANDARD_STATUSES = frozenset({STATUS_SUCCESS, STATUS_ERROR, STATUS_PARTIAL_SUCCESS, STATUS_SKIPPED})
+
+# Keys of a serialized StandardToolResponse
+STANDARD_RESPONSE_FIELDS = frozenset({
+    "status", "tool_name", "timestamp", "data", "error", "summary", "metrics", "warnings"
+})
+
+# Fields that are metadata, not data
+METADATA_FIELDS = frozenset({
+    "status", "error", "reason", "message", "summary", "audit_summary",
+    "timestamp", "execution_time", "warnings", "action"
+})
+
+# Common metric field mappings as (result key, metric key) pairs
+METRIC_MAPPINGS = (
+    ("total_files", "files_analyzed"),
+    ("files_modified", "items_processed"),
+    ("total_dependencies", "items_processed"),
+    ("total_issues", "issues_found"),
+    ("vulnerabilities_found", "issues_found"),
+    ("security_issues", "issues_found")
+)
+METRIC_SOURCE_KEYS = frozenset(result_key for result_key, _ in METRIC_MAPPINGS)
+
+# Metric fields callers may pass explicitly to build_success/build_partial_success
+CUSTOM_METRIC_FIELDS = frozenset({"items_processed", "files_analyzed", "issues_found"})
+
+def _collect_metrics(values: Dict[str, Any]) -> Dict[str, int]:
+    """Map known count fields (ints, or lists counted by length) to their metric names"""
+    metrics_data = {}
+    for result_key, metric_key in METRIC_MAPPINGS:
+        if result_key in values:
+            value = values[result_key]
+            if isinstance(value, (int, list)):
+                metrics_data[metric_key] = len(value) if isinstance(value, list) else value
+    return metrics_data
+
+def _split_result(result: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """Split a result into its data fields and metric values with a single pass over its items"""
+    data = {}
+    metric_sources = {}
+    for key, value in result.items():
+        if key in METADATA_FIELDS:
+            continue
+        data[key] = value
+        if key in METRIC_SOURCE_KEYS:
+            metric_sources[key] = value
+    return data, _collect_metrics(metric_sources) if metric_sources else {}
+
 class ToolResponseBuilder:
     """Builder class for creating standardized tool responses"""
     
+    __slots__ = ("tool_name", "_start_ns", "_fail_prefix", "_skip_prefix", "_partial_summary", "_default_summary")
+    
     def __init__(self, tool_name: str):
         self.tool_name = tool_name
-        self.start_time = time.time()
+        # Summary strings that only depend on the tool name
+        self._fail_prefix = f"Tool {tool_name} failed: "
+        self._skip_prefix = f"Tool {tool_name} skipped: "
+        self._partial_summary = f"Tool {tool_name} completed with some failures"
+        self._default_summary = f"{tool_name} completed successfully"
+        # Monotonic integer clock so execution time cannot go negative on wall-clock adjustments
+        self._start_ns = time.perf_counter_ns()
         
     def build_success(
         self, 
@@ -30,7 +97,7 @@ class ToolResponseBuilder:
     ) -> StandardToolResponse:
         """Build a successful tool response"""
         return StandardToolResponse(
-            status="success",
+            status=STATUS_SUCCESS,
             tool_name=self.tool_name,
             data=data,
             summary=summary or self._generate_default_summary(data),
@@ -47,7 +114,7 @@ class ToolResponseBuilder:
     ) -> StandardToolResponse:
         """Build an error tool response"""
         return StandardToolResponse(
-            status="error",
+            status=STATUS_ERROR,
             tool_name=self.tool_name,
             data=data,
             error=StandardError(
@@ -55,7 +122,7 @@ class ToolResponseBuilder:
                 details=error_details,
                 error_type=error_type
             ),
-            summary=f"Tool {self.tool_name} failed: {error_message}"
+            summary=self._fail_prefix + str(error_message)
         )
     
     def build_partial_success(
@@ -69,15 +136,15 @@ class ToolResponseBuilder:
     ) -> StandardToolResponse:
         """Build a partial success response (some operations succeeded, some failed)"""
         return StandardToolResponse(
-            status="partial_success",
+            status=STATUS_PARTIAL_SUCCESS,
             tool_name=self.tool_name,
             data=data,
             error=StandardError(
                 message=error_message,
                 details=error_details,
-                error_type="partial_failure"
+                error_type=ERROR_TYPE_PARTIAL_FAILURE
             ),
-            summary=summary or f"Tool {self.tool_name} completed with some failures",
+            summary=summary or self._partial_summary,
             metrics=self._build_metrics(metrics, data),
             warnings=warnings
         )
@@ -89,10 +156,10 @@ class ToolResponseBuilder:
     ) -> StandardToolResponse:
         """Build a skipped tool response"""
         return StandardToolResponse(
-            status="skipped",
+            status=STATUS_SKIPPED,
             tool_name=self.tool_name,
             data=data,
-            summary=f"Tool {self.tool_name} skipped: {reason}"
+            summary=self._skip_prefix + str(reason)
         )
     
     def wrap_existing_result(self, existing_result: Dict[str, Any]) -> StandardToolResponse:
@@ -101,18 +168,27 @@ class ToolResponseBuilder:
         
         This method analyzes the existing result structure and maps it to the standard format.
         """
-        # Check if result already has explicit status field
-        if "status" in existing_result:
-            status = existing_result["status"]
+        status = existing_result.get("status")
+        
+        # Malformed results may carry an unhashable status (list, dict), which must not reach the set/dict lookups
+        if isinstance(status, str):
+            # Results already in the standard shape are used as-is instead of being re-scanned
+            if (
+                status in STANDARD_STATUSES
+                and "tool_name" in existing_result
+                and isinstance(existing_result.get("data"), dict)
+                and existing_result.keys() <= STANDARD_RESPONSE_FIELDS
+            ):
+                try:
+                    return StandardToolResponse(**existing_result)
+                except ValueError:
+                    # Not actually a valid standard response (pydantic's ValidationError is a ValueError)
+                    pass
             
-            if status == "success":
-                return self._wrap_success_result(existing_result)
-            elif status == "error":
-                return self._wrap_error_result(existing_result)
-            elif status in ["partial_success", "completed"]:
-                return self._wrap_success_result(existing_result)
-            elif status == "skipped":
-                return self._wrap_skipped_result(existing_result)
+            # Dispatch on an explicit status field when it is a known one
+            handler = STATUS_HANDLERS.get(status)
+            if handler is not None:
+                return handler(self, existing_result)
         
         # Check for error indicators
         if "error" in existing_result:
@@ -123,20 +199,21 @@ class ToolResponseBuilder:
     
     def _wrap_success_result(self, result: Dict[str, Any]) -> StandardToolResponse:
         """Wrap a successful result"""
-        # Extract known fields
-        data = self._extract_data_from_result(result)
+        # Extract data and metrics together
+        data, metrics_data = _split_result(result)
+        data = data or result
         summary = result.get("summary") or result.get("message") or result.get("audit_summary")
         warnings = result.get("warnings")
         
-        # Extract metrics
-        metrics = self._extract_metrics_from_result(result)
+        # Add execution time
+        metrics_data["execution_time_ms"] = self._execution_time_ms()
         
         return StandardToolResponse(
-            status="success",
+            status=STATUS_SUCCESS,
             tool_name=self.tool_name,
             data=data,
             summary=summary or self._generate_default_summary(data),
-            metrics=metrics,
+            metrics=StandardMetrics(**metrics_data),
             warnings=warnings
         )
     
@@ -146,15 +223,15 @@ class ToolResponseBuilder:
         error_details = result.get("reason") or result.get("details")
         
         return StandardToolResponse(
-            status="error",
+            status=STATUS_ERROR,
             tool_name=self.tool_name,
             data=self._extract_data_from_result(result),
             error=StandardError(
                 message=str(error_message),
                 details=error_details,
-                error_type="tool_execution_error"
+                error_type=ERROR_TYPE_TOOL_EXECUTION
             ),
-            summary=f"Tool {self.tool_name} failed: {error_message}"
+            summary=self._fail_prefix + str(error_message)
         )
     
     def _wrap_skipped_result(self, result: Dict[str, Any]) -> StandardToolResponse:
@@ -162,81 +239,40 @@ class ToolResponseBuilder:
         reason = result.get("reason", "Unknown reason")
         
         return StandardToolResponse(
-            status="skipped",
+            status=STATUS_SKIPPED,
             tool_name=self.tool_name,
             data=self._extract_data_from_result(result),
-            summary=f"Tool {self.tool_name} skipped: {reason}"
+            summary=self._skip_prefix + str(reason)
         )
     
     def _extract_data_from_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """
         Extract the actual data content from a result, excluding metadata fields
         """
-        # Fields that are metadata, not data
-        metadata_fields = {
-            "status", "error", "reason", "message", "summary", "audit_summary", 
-            "timestamp", "execution_time", "warnings", "action"
-        }
-        
-        # Extract data fields
-        data = {}
-        for key, value in result.items():
-            if key not in metadata_fields:
-                data[key] = value
+        data = {key: value for key, value in result.items() if key not in METADATA_FIELDS}
         
         return data if data else result
     
-    def _extract_metrics_from_result(self, result: Dict[str, Any]) -> Optional[StandardMetrics]:
-        """Extract metrics from existing result structure"""
-        metrics_data = {}
-        
-        # Common metric field mappings
-        metric_mappings = {
-            "total_files": "files_analyzed",
-            "files_modified": "items_processed", 
-            "total_dependencies": "items_processed",
-            "total_issues": "issues_found",
-            "vulnerabilities_found": "issues_found",
-            "security_issues": "issues_found"
-        }
-        
-        # Extract metrics based on known field names
-        for result_key, metric_key in metric_mappings.items():
-            if result_key in result:
-                value = result[result_key]
-                if isinstance(value, (int, list)):
-                    metrics_data[metric_key] = len(value) if isinstance(value, list) else value
-        
-        # Add execution time
-        execution_time_ms = int((time.time() - self.start_time) * 1000)
-        metrics_data["execution_time_ms"] = execution_time_ms
-        
-        return StandardMetrics(**metrics_data) if metrics_data else None
-    
     def _build_metrics(self, custom_metrics: Optional[Dict[str, Any]], data: Any) -> Optional[StandardMetrics]:
         """Build metrics from custom metrics and data analysis"""
         metrics_data = {}
         
         # Add custom metrics if provided
         if custom_metrics:
-            for key, value in custom_metrics.items():
-                if key in ["items_processed", "files_analyzed", "issues_found"]:
-                    metrics_data[key] = value
+            metrics_data = {key: value for key, value in custom_metrics.items() if key in CUSTOM_METRIC_FIELDS}
         
         # Try to extract metrics from data if it's a dict
         if isinstance(data, dict):
-            metrics_from_data = self._extract_metrics_from_result(data)
-            if metrics_from_data:
-                for field in ["items_processed", "files_analyzed", "issues_found"]:
-                    value = getattr(metrics_from_data, field, None)
-                    if value is not None:
-                        metrics_data[field] = value
+            metrics_data.update(_collect_metrics(data))
         
         # Always add execution time
-        execution_time_ms = int((time.time() - self.start_time) * 1000)
-        metrics_data["execution_time_ms"] = execution_time_ms
+        metrics_data["execution_time_ms"] = self._execution_time_ms()
         
-        return StandardMetrics(**metrics_data) if metrics_data else None
+        return StandardMetrics(**metrics_data)
+    
+    def _execution_time_ms(self) -> int:
+        """Milliseconds elapsed since the builder was created"""
+        return (time.perf_counter_ns() - self._start_ns) // 1_000_000
     
     def _generate_default_summary(self, data: Any) -> str:
         """Generate a default summary based on the tool name and data"""
@@ -248,15 +284,25 @@ class ToolResponseBuilder:
                 count = data["vulnerabilities_found"]
                 return f"{self.tool_name} found {count} vulnerabilities"
             elif "dependencies_by_language" in data:
-                total = sum(len(deps) for deps in data["dependencies_by_language"].values())
+                total = sum(map(len, data["dependencies_by_language"].values()))
                 return f"{self.tool_name} analyzed {total} dependencies"
             elif "architectural_patterns" in data:
                 count = len(data["architectural_patterns"])
                 return f"{self.tool_name} identified {count} architectural patterns"
         
-        return f"{self.tool_name} completed successfully"
+        return self._default_summary
+
+
+# Wrapper for each explicit result status; results with other statuses fall back to error detection
+STATUS_HANDLERS = {
+    STATUS_SUCCESS: ToolResponseBuilder._wrap_success_result,
+    STATUS_ERROR: ToolResponseBuilder._wrap_error_result,
+    STATUS_PARTIAL_SUCCESS: ToolResponseBuilder._wrap_success_result,
+    STATUS_COMPLETED: ToolResponseBuilder._wrap_success_result,
+    STATUS_SKIPPED: ToolResponseBuilder._wrap_skipped_result
+}
 
 
 def create_tool_response_builder(tool_name: str) -> ToolResponseBuilder:
     """Factory function to create a ToolResponseBuilder"""
-    return ToolResponseBuilder(tool_name) 
+    return ToolResponseBuilder(tool_name)
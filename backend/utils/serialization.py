@@ -0,0 +1,34 @@
+"""
+Serialization - Fast JSON encoding and decoding with a standard library fallback
+
+This module uses orjson when it is installed and falls back to the json module
+otherwise, so callers get the same compact output either way.
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None, sort_keys: bool = False) -> str:
+    """Serialize obj to a compact JSON string, optionally with sorted keys for canonical output"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode("utf-8")
+        except TypeError:
+            # orjson rejects some inputs json accepts (e.g. integers over 64 bits)
+            pass
+    return json.dumps(obj, separators=(",", ":"), default=default, sort_keys=sort_keys)
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Deserialize a JSON document, raising json.JSONDecodeError on invalid input"""
+    if orjson is not None:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+    return json.loads(data)
@@ -4,6 +4,9 @@ Tool metadata decorator for adding category and other metadata to LangChain tool
 
 from typing import Any
 
+# Distinguishes a missing attribute from one explicitly set to None
+_MISSING = object()
+
 def tool_category(category: str, **metadata):
     """
     Decorator to add category and additional metadata to tools.
@@ -33,10 +36,12 @@ def tool_category(category: str, **metadata):
                     object.__setattr__(func_or_tool, key, value)
             except Exception:
                 # If that fails, store in a metadata dict
-                if not hasattr(func_or_tool, '_custom_metadata'):
-                    object.__setattr__(func_or_tool, '_custom_metadata', {})
-                func_or_tool._custom_metadata['category'] = category
-                func_or_tool._custom_metadata.update(metadata)
+                custom_metadata = getattr(func_or_tool, '_custom_metadata', None)
+                if custom_metadata is None:
+                    custom_metadata = {}
+                    object.__setattr__(func_or_tool, '_custom_metadata', custom_metadata)
+                custom_metadata['category'] = category
+                custom_metadata.update(metadata)
         else:
             # Regular function - add metadata that will be preserved by @tool or @async_tool
             func_or_tool.category = category
@@ -60,11 +65,13 @@ def get_tool_metadata(tool, key: str, default: Any = None) -> Any:
         The metadata value or default
     """
     # First try direct attribute access
-    if hasattr(tool, key):
-        return getattr(tool, key, default)
+    value = getattr(tool, key, _MISSING)
+    if value is not _MISSING:
+        return value
     
     # Then try custom metadata dict
-    if hasattr(tool, '_custom_metadata') and key in tool._custom_metadata:
-        return tool._custom_metadata[key]
+    custom_metadata = getattr(tool, '_custom_metadata', None)
+    if custom_metadata is not None and key in custom_metadata:
+        return custom_metadata[key]
     
     return default 